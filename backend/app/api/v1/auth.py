@@ -1,13 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from datetime import timedelta
+import logging
+import math
 from app.api.v1.schemas.auth import UserCreate, UserOut, UserLogin, Token
 from app.services import auth as auth_service
 from app.core.config import settings
 from app.db import client
+from app.services.rate_limit import rate_limiter
 
 router = APIRouter()
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 @router.post("/register", response_model=UserOut)
 async def register(user_in: UserCreate):
@@ -21,6 +26,18 @@ async def register(user_in: UserCreate):
 
 @router.post("/login")
 async def login(form_data: UserLogin, response: Response):
+    # Throttle per username before the (expensive) bcrypt check
+    throttle = await rate_limiter.hit(
+        f"login:user:{form_data.username}",
+        settings.LOGIN_USERNAME_RATE_LIMIT_PER_MINUTE,
+        settings.LOGIN_USERNAME_RATE_LIMIT_BURST,
+    )
+    if not throttle.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts",
+            headers={"Retry-After": str(max(1, math.ceil(throttle.retry_after)))},
+        )
     user = await auth_service.authenticate_user(form_data)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
@@ -53,7 +70,12 @@ async def me(current_user=Depends(get_current_user)):
 
 
 @router.post("/logout")
-async def logout(response: Response):
-    # Clear the cookie
+async def logout(request: Request, response: Response):
+    # Revoke the token server-side so it is rejected even if the cookie was copied, then clear the cookie.
+    # A failed revoke must not block logout: the cookie is cleared regardless.
+    try:
+        await auth_service.revoke_token(request.cookies.get(settings.COOKIE_NAME))
+    except Exception:
+        logger.exception("Failed to revoke token on logout")
     response.delete_cookie(key=settings.COOKIE_NAME, path="/", domain=settings.COOKIE_DOMAIN)
     return {"message": "logged out"}
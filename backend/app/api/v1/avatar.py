@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Query, status
+from app.api.v1.schemas.avatar import AvatarJobCreate, AvatarJobOut
+from app.services.avatar import avatar_jobs, AvatarJobLimitError
+from app.core.config import settings
+
+router = APIRouter()
+
+def get_current_user(request: Request):
+    if not hasattr(request.state, "user") or not request.state.user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return request.state.user
+
+@router.post("/jobs", response_model=AvatarJobOut, status_code=status.HTTP_202_ACCEPTED)
+async def submit_avatar_job(body: AvatarJobCreate, user=Depends(get_current_user)):
+    try:
+        job = avatar_jobs.submit(user.id, body.options)
+    except AvatarJobLimitError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+    return AvatarJobOut.model_validate(job)
+
+@router.get("/jobs/{job_id}", response_model=AvatarJobOut)
+async def get_avatar_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, description="Seconds to wait for the job to finish (long-polling)"),
+    user=Depends(get_current_user)
+):
+    job = avatar_jobs.get(job_id)
+    if not job or job.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job = await avatar_jobs.wait(job, min(wait, settings.AVATAR_MAX_WAIT_SECONDS))
+    return AvatarJobOut.model_validate(job)
@@ -1,7 +1,7 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, Form
 from typing import List
-from app.api.v1.schemas.questionnaire import QuestionDTO, QuestionType
+from app.api.v1.schemas.questionnaire import QuestionDTO, QuestionType, LikertDistributionDTO, UserScoreDTO
 from app.services import questionnaire as questionnaire_service
 from app.services.s3 import s3_service
 from pydantic import BaseModel
@@ -61,3 +61,13 @@ async def answer_question(
         audio_path=audio_path
     )
     return {"status": "success", "id": response.id}
+
+@router.get("/analytics/questions", response_model=List[LikertDistributionDTO])
+async def get_question_analytics(user=Depends(get_current_user)):
+    distributions = await questionnaire_service.get_likert_distributions()
+    return [LikertDistributionDTO(**d) for d in distributions]
+
+@router.get("/analytics/me", response_model=UserScoreDTO)
+async def get_my_score(user=Depends(get_current_user)):
+    score = await questionnaire_service.get_user_score(user.id)
+    return UserScoreDTO(**score)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 from app.api.v1.auth import router as auth_router
 from app.api.v1.questionnaire import router as questionnaire_router
+from app.api.v1.avatar import router as avatar_router
 
 router = APIRouter()
 
@@ -10,5 +11,6 @@ async def health():
 
 router.include_router(auth_router, prefix="/auth", tags=["auth"])
 router.include_router(questionnaire_router, prefix="/questionnaire", tags=["questionnaire"])
+router.include_router(avatar_router, prefix="/avatar", tags=["avatar"])
 
 # Add other API routes here
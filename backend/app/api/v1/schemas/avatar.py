@@ -0,0 +1,24 @@
+import json
+from typing import Any
+from pydantic import Field, field_validator
+from ._base import CamelModel
+from app.core.config import settings
+from app.services.avatar import AvatarJobStatus
+
+
+class AvatarJobCreate(CamelModel):
+    options: dict[str, Any] = Field(default_factory=dict)
+
+    @field_validator("options")
+    @classmethod
+    def limit_options_size(cls, v: dict[str, Any]) -> dict[str, Any]:
+        if len(json.dumps(v, default=str)) > settings.AVATAR_MAX_OPTIONS_BYTES:
+            raise ValueError(f"options must serialize to at most {settings.AVATAR_MAX_OPTIONS_BYTES} bytes")
+        return v
+
+
+class AvatarJobOut(CamelModel):
+    id: str
+    status: AvatarJobStatus
+    result_path: str | None = None
+    error: str | None = None
@@ -16,3 +16,16 @@ class QuestionDTO(BaseModel):
 class LikertAnswerCreate(BaseModel):
     question_id: str
     likert_value: int
+
+class LikertDistributionDTO(BaseModel):
+    question_id: str
+    question: str
+    counts: dict[int, int]
+    total: int
+    mean: float | None = None
+
+class UserScoreDTO(BaseModel):
+    user_id: int
+    response_count: int
+    likert_sum: int
+    mean: float | None = None
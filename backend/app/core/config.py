@@ -9,6 +9,8 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str = "super-secret-change-me"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 1 day by default
+    JWT_CLAIMS_CACHE_SIZE: int = 10_000
+    JWT_REVOCATION_SYNC_SECONDS: int = 30
     # Cookie-based auth settings
     CLIENT_URL: str = "http://localhost:3000"
     COOKIE_NAME: str = "access_token"
@@ -25,6 +27,12 @@ class Settings(BaseSettings):
     LLM_API_KEY: str | None = None
     AVATAR_API_URL: str | None = None
     AVATAR_API_KEY: str | None = None
+    AVATAR_API_TIMEOUT_SECONDS: float = 300.0
+    AVATAR_MAX_CONCURRENT_JOBS: int = 4
+    AVATAR_JOB_TTL_SECONDS: int = 60 * 60
+    AVATAR_MAX_WAIT_SECONDS: float = 30.0
+    AVATAR_MAX_ACTIVE_JOBS_PER_USER: int = 3
+    AVATAR_MAX_OPTIONS_BYTES: int = 4096
 
     # S3 Settings
     S3_BUCKET_NAME: str = "altai-digital-twin-audio"
@@ -38,6 +46,42 @@ class Settings(BaseSettings):
     S3_SECRET_KEY: str | None = None
     S3_REGION: str | None = None
 
+    # Twin prompt context assembly (token counts are approximate: ~4 characters per token)
+    TWIN_CONTEXT_TOKEN_BUDGET: int = 4000
+    TWIN_CONTEXT_MEMORY_TOKENS: int = 1500
+    TWIN_CONTEXT_TOP_K: int = 8
+    TWIN_CONTEXT_CACHE_SIZE: int = 1000
+    TWIN_CONTEXT_TTL_SECONDS: float = 300.0
+
+    # Rate limiting (token bucket). Backend is "memory" (per-process) or "postgres" (shared across workers)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    # Number of reverse proxies in front of the app that append to X-Forwarded-For (0 = ignore the header)
+    RATE_LIMIT_TRUSTED_PROXIES: int = 0
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    # How often idle buckets are purged from the shared (postgres) backend
+    RATE_LIMIT_CLEANUP_SECONDS: int = 300
+    # Global per-IP budget applied to every request
+    RATE_LIMIT_PER_MINUTE: int = 300
+    RATE_LIMIT_BURST: int = 100
+    # Stricter per-IP budget for /auth/login and /auth/register
+    AUTH_RATE_LIMIT_PER_MINUTE: int = 20
+    AUTH_RATE_LIMIT_BURST: int = 10
+    # Per-username budget for login attempts (checked before the bcrypt verification)
+    LOGIN_USERNAME_RATE_LIMIT_PER_MINUTE: int = 5
+    LOGIN_USERNAME_RATE_LIMIT_BURST: int = 5
+
+    # Tracing (spans exported to "console" logs or a "file" of JSON lines) and slow-request profiling
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "console"
+    TRACING_FILE: str = "traces.jsonl"
+    TRACING_SAMPLE_RATE: float = 1.0
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 1.0  # fraction of requests that are profiled
+    PROFILING_SLOW_REQUEST_MS: float = 1000.0
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_OUTPUT_DIR: str = "profiles"
+
     # Add other settings and secrets here
 
     class Config:
@@ -0,0 +1,115 @@
+from __future__ import annotations
+import bisect
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType
+from typing import Iterable, Optional
+
+
+def folded(stacks: Iterable[tuple[str, ...]]) -> str:
+    """Aggregate stacks (root first) as folded lines ("outer;inner;leaf count"), the input of flamegraph.pl, inferno and speedscope."""
+    return "\n".join(f"{';'.join(stack)} {count}" for stack, count in Counter(stacks).most_common())
+
+
+class SamplingProfiler:
+    """
+    Shared sampler of one thread's call stack (the event loop thread by default).
+    A single background thread runs while at least one request is being profiled and records
+    timestamped stacks into a bounded buffer; each request keeps its own start/end times and reads
+    back the samples of its window. Cost therefore does not grow with the number of concurrent
+    requests. Because asyncio runs every request on the same thread, a window can still contain
+    samples from other requests that were running at the same time.
+    Samples older than the oldest active request are dropped as requests end, and identical stacks
+    share one tuple of cached frame labels, so the buffer stays small under sustained load.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.005, max_samples: int = 100_000):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_samples = max_samples
+        # parallel lists ordered by time, so a request's window is found with bisect
+        self._times: list[float] = []
+        self._stacks: list[tuple[str, ...]] = []
+        self._starts: list[float] = []
+        self._labels: dict[CodeType, str] = {}
+        self._interned: dict[tuple[str, ...], tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def begin(self) -> float:
+        """Register a profiled request and return its start time."""
+        with self._lock:
+            if self.thread_id is None:
+                self.thread_id = threading.get_ident()
+            started = time.perf_counter()
+            bisect.insort(self._starts, started)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+                self._thread.start()
+        return started
+
+    def end(self, started: float) -> list[tuple[str, ...]]:
+        """Unregister a profiled request and return the stacks sampled since `started`."""
+        ended = time.perf_counter()
+        with self._lock:
+            lo = bisect.bisect_left(self._times, started)
+            hi = bisect.bisect_right(self._times, ended)
+            stacks = self._stacks[lo:hi]
+            del self._starts[bisect.bisect_left(self._starts, started)]
+            if self._starts:
+                # no remaining request can read samples taken before it began
+                self._trim(bisect.bisect_left(self._times, self._starts[0]))
+            else:
+                self._times.clear()
+                self._stacks.clear()
+                self._interned.clear()
+        return stacks
+
+    def _trim(self, count: int):
+        del self._times[:count]
+        del self._stacks[:count]
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._starts:
+                    self._thread = None
+                    return
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            if not stack:
+                continue
+            stack.reverse()
+            key = tuple(stack)
+            with self._lock:
+                key = self._interned.setdefault(key, key)
+                if len(self._times) >= self.max_samples:
+                    # drop the oldest tenth at once rather than shifting the lists on every sample
+                    self._trim(max(1, self.max_samples // 10))
+                self._times.append(time.perf_counter())
+                self._stacks.append(key)
+
+    @staticmethod
+    def dump(stacks: Iterable[tuple[str, ...]], directory: str, name: str) -> str:
+        os.makedirs(directory, exist_ok=True)
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_")
+        # random suffix: concurrent untraced requests to the same path can finish in the same millisecond
+        path = os.path.join(directory, f"{int(time.time() * 1000)}-{safe_name}-{secrets.token_hex(4)}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(folded(stacks) + "\n")
+        return path
@@ -0,0 +1,181 @@
+from __future__ import annotations
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import random
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
+from app.core.config import settings
+
+logger = logging.getLogger("app.tracing")
+
+
+@dataclass
+class Span:
+    """A timed operation, shaped after OpenTelemetry spans (trace id, span id, parent, attributes)."""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    sampled: bool
+    start: float = field(default_factory=time.time)
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: str = "OK"
+    duration_ms: float | None = None
+    _start_perf: float = field(default_factory=time.perf_counter, repr=False)
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class ConsoleExporter:
+    """
+    Prints finished spans to stderr. Writes directly instead of logging, because uvicorn leaves the root
+    logger at WARNING and INFO records from "app.tracing" would be dropped.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def export(self, span: Span):
+        indent = "  " if span.parent_id else ""
+        print(
+            f"{indent}{span.name} {span.duration_ms:.2f}ms trace={span.trace_id} {span.attributes or ''}",
+            file=self.stream or sys.stderr,
+            flush=True,
+        )
+
+
+class FileExporter:
+    """Appends finished spans as JSON lines; safe to use from worker threads (asyncio.to_thread)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class _NoopSpan(Span):
+    """Shared span yielded while tracing is disabled; attribute writes are dropped."""
+
+    def set_attribute(self, key: str, value: Any):
+        return None
+
+
+_NOOP = _NoopSpan(name="noop", trace_id="", span_id="", parent_id=None, sampled=False)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Minimal tracer. Spans nest through a context variable, so they follow awaits and asyncio.to_thread.
+    The sampling decision is taken at the root span and inherited by its children. When disabled,
+    `span()` yields a shared no-op span and costs a single attribute check.
+    """
+
+    def __init__(self, enabled: bool = False, exporter=None, sample_rate: float = 1.0):
+        self.enabled = enabled
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        if not self.enabled:
+            yield _NOOP
+            return
+
+        parent = _current_span.get()
+        if parent is None:
+            trace_id = secrets.token_hex(16)
+            sampled = random.random() < self.sample_rate
+        else:
+            trace_id = parent.trace_id
+            sampled = parent.sampled
+        span = Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            sampled=sampled,
+            attributes=attributes,
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "ERROR"
+            span.set_attribute("error", repr(e))
+            raise
+        finally:
+            _current_span.reset(token)
+            span.duration_ms = (time.perf_counter() - span._start_perf) * 1000
+            if span.sampled and self.exporter is not None:
+                try:
+                    self.exporter.export(span)
+                except Exception:
+                    logger.exception("Failed to export span %s", span.name)
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+
+def create_exporter(name: str | None = None):
+    name = (name or settings.TRACING_EXPORTER or "console").lower()
+    if name == "console":
+        return ConsoleExporter()
+    if name == "file":
+        return FileExporter(settings.TRACING_FILE)
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown tracing exporter: {name}")
+
+
+tracer = Tracer(
+    enabled=settings.TRACING_ENABLED,
+    exporter=create_exporter() if settings.TRACING_ENABLED else None,
+    sample_rate=settings.TRACING_SAMPLE_RATE,
+)
+
+
+def traced(name: str) -> Callable:
+    """Decorator wrapping a sync or async function in a span."""
+
+    def decorator(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
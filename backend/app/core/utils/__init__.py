@@ -1,5 +1,5 @@
 from .password import hash_password, verify_password
-from .jwt import create_access_token, decode_access_token
+from .jwt import create_access_token, decode_access_token, token_verifier, RevokedTokenError
 from .dates import to_utc, date_to_datetime_min, date_to_datetime_max, now_utc, datetime_to_iso
 
 __all__ = [
@@ -7,6 +7,8 @@ __all__ = [
 	"verify_password",
 	"create_access_token",
 	"decode_access_token",
+	"token_verifier",
+	"RevokedTokenError",
 	"to_utc",
 	"date_to_datetime_min",
 	"date_to_datetime_max",
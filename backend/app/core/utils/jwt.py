@@ -1,10 +1,73 @@
 from __future__ import annotations
 import jwt
-from typing import Any, Optional
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
 from datetime import datetime, timedelta
 from app.core.config import settings
 
 
+class RevokedTokenError(jwt.InvalidTokenError):
+    pass
+
+
+class TokenVerifier:
+    """
+    Verifies access tokens and caches the decoded claims of recently seen tokens.
+    Cache entries are bounded (LRU) and never outlive the token's `exp`. Revoked token ids (`jti`)
+    are kept in a small in-memory map of jti -> exp that is synced from the database by the auth service.
+    """
+
+    def __init__(self, secret_key: str, algorithm: str, max_entries: int = 10_000):
+        self.secret_key = secret_key
+        self.algorithms = [algorithm]
+        self.max_entries = max_entries
+        self._cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._revoked: dict[str, float] = {}
+
+    def verify(self, token: str) -> dict[str, Any]:
+        now = time.time()
+        claims = self._cache.get(token)
+        if claims is not None:
+            if claims.get("exp", 0) <= now:
+                del self._cache[token]
+                raise jwt.ExpiredSignatureError("Signature has expired")
+            self._cache.move_to_end(token)
+        else:
+            claims = jwt.decode(token, self.secret_key, algorithms=self.algorithms)
+            if "exp" in claims:
+                self._cache[token] = claims
+                if len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+
+        if claims.get("jti") in self._revoked:
+            raise RevokedTokenError("Token has been revoked")
+        return claims
+
+    def revoke(self, jti: str, exp: float):
+        self._revoked[jti] = float(exp)
+
+    def load_revocations(self, revocations: Iterable[tuple[str, float]]):
+        for jti, exp in revocations:
+            self.revoke(jti, exp)
+        self.purge_expired()
+
+    def is_revoked(self, jti: str | None) -> bool:
+        return jti is not None and jti in self._revoked
+
+    def purge_expired(self):
+        now = time.time()
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+
+    def clear(self):
+        self._cache.clear()
+        self._revoked.clear()
+
+
+token_verifier = TokenVerifier(settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM, settings.JWT_CLAIMS_CACHE_SIZE)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -12,10 +75,11 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    # unique token id so individual tokens can be revoked on logout
+    to_encode.setdefault("jti", uuid.uuid4().hex)
+    encoded_jwt = jwt.encode(to_encode, token_verifier.secret_key, algorithm=token_verifier.algorithms[0])
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> dict[str, Any]:
-    payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-    return payload
+    return token_verifier.verify(token)
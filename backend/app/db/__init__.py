@@ -1,5 +1,30 @@
 from prisma import Prisma
 import asyncio
+import functools
+import inspect
+from app.core.tracing import tracer
+
+
+def _traced_call(fn, name: str):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        with tracer.span(name):
+            return await fn(*args, **kwargs)
+    return wrapper
+
+
+class _TracedActions:
+    """Wraps a Prisma model actions object (e.g. `client.user`) so each query runs in a span."""
+
+    def __init__(self, actions, name: str):
+        self._actions = actions
+        self._name = name
+
+    def __getattr__(self, attr):
+        value = getattr(self._actions, attr)
+        if inspect.iscoroutinefunction(value):
+            return _traced_call(value, f"{self._name}.{attr}")
+        return value
 
 
 class PrismaWrapper:
@@ -32,7 +57,15 @@ class PrismaWrapper:
 
     def __getattr__(self, name):
         # Delegate attribute access to the underlying Prisma client
-        return getattr(self._client, name)
+        value = getattr(self._client, name)
+        if not tracer.enabled:
+            return value
+        # With tracing on, wrap raw queries (client.query_raw) and model actions (client.user.find_unique)
+        if inspect.iscoroutinefunction(value):
+            return _traced_call(value, f"prisma.{name}")
+        if not callable(value) and hasattr(value, "find_many"):
+            return _TracedActions(value, f"prisma.{name}")
+        return value
 
 
 client = PrismaWrapper()
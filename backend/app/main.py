@@ -1,13 +1,21 @@
+import asyncio
 from fastapi import FastAPI
 from app.api.v1.routes import router as v1_router
 from app.db import client
 from app.middleware.cookie_auth import CookieAuthMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.tracing import TracingMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.services import auth as auth_service
+from app.services import rate_limit as rate_limit_service
 
 app = FastAPI(title="Altai Digital Twin - Backend")
-app.add_middleware(CORSMiddleware, allow_origins=[settings.CLIENT_URL], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+# Middleware added last runs first: tracing -> CORS -> rate limiting -> cookie auth
 app.add_middleware(CookieAuthMiddleware)
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(CORSMiddleware, allow_origins=[settings.CLIENT_URL], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+app.add_middleware(TracingMiddleware)
 
 app.include_router(v1_router, prefix="/api/v1")
 
@@ -16,10 +24,18 @@ app.include_router(v1_router, prefix="/api/v1")
 async def startup_event():
     # connect Prisma client
     await client.connect()
+    # keep the in-memory token revocation list in sync with the DB
+    app.state.revocation_sync = asyncio.create_task(auth_service.revocation_sync_loop())
+    # drop idle buckets from the shared rate limit table
+    app.state.rate_limit_cleanup = asyncio.create_task(rate_limit_service.rate_limit_cleanup_loop())
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    for name in ("revocation_sync", "rate_limit_cleanup"):
+        task = getattr(app.state, name, None)
+        if task:
+            task.cancel()
     await client.disconnect()
 
 
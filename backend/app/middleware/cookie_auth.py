@@ -4,6 +4,7 @@ from starlette.responses import Response
 from typing import Callable
 import jwt
 from app.core.config import settings
+from app.core.tracing import tracer
 from app.db import client
 from app.services import auth as auth_service
 from fastapi import HTTPException
@@ -14,14 +15,15 @@ class CookieAuthMiddleware(BaseHTTPMiddleware):
         # Extract token from cookie
         token = request.cookies.get(settings.COOKIE_NAME)
         
-        if token:
-            try:
-                user = await auth_service.get_user_from_token(token)
-                request.state.user = user
-            except Exception:
+        with tracer.span("auth.cookie", has_token=bool(token)):
+            if token:
+                try:
+                    user = await auth_service.get_user_from_token(token)
+                    request.state.user = user
+                except Exception:
+                    request.state.user = None
+            else:
                 request.state.user = None
-        else:
-            request.state.user = None
 
         response = await call_next(request)
         return response
@@ -0,0 +1,43 @@
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from typing import Callable
+import math
+from app.core.config import settings
+from app.services.rate_limit import rate_limiter, client_ip
+
+AUTH_PATHS = frozenset({"/api/v1/auth/login", "/api/v1/auth/register"})
+
+
+def too_many_requests(retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many requests"},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """
+    Per-IP token-bucket throttling. Runs before CookieAuthMiddleware so rejected requests never
+    reach the user lookup. Login/register get an additional, stricter per-IP bucket; the per-username
+    login bucket is applied in the route once the body has been parsed.
+    """
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        if not rate_limiter.enabled or request.method == "OPTIONS":
+            return await call_next(request)
+
+        ip = client_ip(request)
+        result = await rate_limiter.hit(f"ip:{ip}", settings.RATE_LIMIT_PER_MINUTE, settings.RATE_LIMIT_BURST)
+        if not result.allowed:
+            return too_many_requests(result.retry_after)
+
+        if request.url.path in AUTH_PATHS:
+            result = await rate_limiter.hit(
+                f"auth:ip:{ip}", settings.AUTH_RATE_LIMIT_PER_MINUTE, settings.AUTH_RATE_LIMIT_BURST
+            )
+            if not result.allowed:
+                return too_many_requests(result.retry_after)
+
+        return await call_next(request)
@@ -0,0 +1,46 @@
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from typing import Callable
+import logging
+import random
+import time
+from app.core.config import settings
+from app.core.profiling import SamplingProfiler
+from app.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# One sampler thread shared by all profiled requests, started on demand
+profiler = SamplingProfiler(interval=settings.PROFILING_INTERVAL_MS / 1000)
+
+
+class TracingMiddleware(BaseHTTPMiddleware):
+    """
+    Opens the root span of each request, so spans from the auth middleware, Prisma, S3 and the vector DB
+    nest under it. With PROFILING_ENABLED, a PROFILING_SAMPLE_RATE fraction of requests is profiled by the
+    shared sampler and a folded-stack flamegraph is written to PROFILING_OUTPUT_DIR when one takes
+    longer than PROFILING_SLOW_REQUEST_MS.
+    """
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        if not tracer.enabled and not settings.PROFILING_ENABLED:
+            return await call_next(request)
+
+        profiled = settings.PROFILING_ENABLED and random.random() < settings.PROFILING_SAMPLE_RATE
+        started = profiler.begin() if profiled else time.perf_counter()
+        trace_id = ""
+        try:
+            with tracer.span("http.request", method=request.method, path=request.url.path) as span:
+                trace_id = span.trace_id
+                response = await call_next(request)
+                span.set_attribute("status_code", response.status_code)
+            return response
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if profiled:
+                stacks = profiler.end(started)
+                if elapsed_ms >= settings.PROFILING_SLOW_REQUEST_MS:
+                    name = f"{request.method}-{request.url.path}-{trace_id or 'untraced'}"
+                    path = profiler.dump(stacks, settings.PROFILING_OUTPUT_DIR, name)
+                    logger.warning("Slow request %s %s took %.0fms, profile written to %s", request.method, request.url.path, elapsed_ms, path)
@@ -1,8 +1,17 @@
 # pydantic models and shared types
 from pydantic import BaseModel
 from typing import Optional
+from datetime import date
 
 class Health(BaseModel):
     status: str
 
+class TokenUser(BaseModel):
+    """User built from access-token claims, used instead of a DB row for authenticated requests."""
+    id: int
+    username: str
+    gender: Optional[str] = None
+    birthdate: Optional[date] = None
+    created_at: Optional[str] = None
+
 # Add pydantic models for API requests/responses here
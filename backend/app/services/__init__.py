@@ -4,5 +4,7 @@ from . import vector_db as vector_db
 from . import llm as llm
 from . import avatar as avatar
 from . import interview as interview
+from . import rate_limit as rate_limit
+from . import twin_context as twin_context
 
-__all__ = ["auth", "ml", "vector_db", "llm", "avatar", "interview"]
+__all__ = ["auth", "ml", "vector_db", "llm", "avatar", "interview", "rate_limit", "twin_context"]
@@ -1,12 +1,17 @@
 from __future__ import annotations
-from datetime import datetime, timedelta
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from datetime import datetime as _dt, time as _time
-from app.core.utils.dates import date_to_datetime_min
+from app.core.utils.dates import date_to_datetime_min, datetime_to_iso, now_utc
 from app.api.v1.schemas.auth import UserCreate, UserLogin
-from app.core.utils import hash_password, verify_password, create_access_token, decode_access_token
+from app.core.utils import hash_password, verify_password, create_access_token, decode_access_token, token_verifier
 from app.core.config import settings
 from app.db import client
+from app.models import TokenUser
+
+logger = logging.getLogger(__name__)
 
 
 # password and jwt helpers have been moved to `app.core.utils`
@@ -45,7 +50,30 @@ async def authenticate_user(login_in: UserLogin):
 
 
 def create_token_for_user(user, expires_delta: Optional[timedelta] = None):
-    return create_access_token({"user_id": int(user.id)}, expires_delta=expires_delta)
+    # Embed the immutable profile fields so authenticated requests (and /auth/me) need no DB lookup
+    birthdate = getattr(user, "birthdate", None)
+    if isinstance(birthdate, datetime):
+        birthdate = birthdate.date()
+    return create_access_token({
+        "user_id": int(user.id),
+        "username": user.username,
+        "gender": getattr(user, "gender", None),
+        "birthdate": birthdate.isoformat() if birthdate else None,
+        "created_at": datetime_to_iso(getattr(user, "createdAt", None)),
+    }, expires_delta=expires_delta)
+
+
+def user_from_claims(payload: dict) -> Optional[TokenUser]:
+    # Tokens issued before profile claims were embedded fall back to a DB lookup
+    if not payload.get("username") or not payload.get("created_at"):
+        return None
+    return TokenUser(
+        id=int(payload["user_id"]),
+        username=payload["username"],
+        gender=payload.get("gender"),
+        birthdate=payload.get("birthdate"),
+        created_at=payload["created_at"],
+    )
 
 
 async def get_user_from_token(token: Optional[str]):
@@ -56,12 +84,64 @@ async def get_user_from_token(token: Optional[str]):
         user_id = payload.get("user_id")
         if not user_id:
             return None
+        user = user_from_claims(payload)
+        if user:
+            return user
         user = await client.user.find_unique(where={"id": int(user_id)})
         return user
     except Exception:
         return None
 
 
+async def revoke_token(token: Optional[str]) -> bool:
+    """Persist the token's jti in the revocation list and apply it locally right away."""
+    if not token:
+        return False
+    try:
+        payload = decode_access_token(token)
+    except Exception:
+        return False
+    jti = payload.get("jti")
+    if not jti:
+        return False
+    expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+    await client.revokedtoken.upsert(
+        where={"jti": jti},
+        data={
+            "create": {"jti": jti, "userId": int(payload["user_id"]), "expiresAt": expires_at},
+            "update": {},
+        },
+    )
+    token_verifier.revoke(jti, payload["exp"])
+    return True
+
+
+_last_revocation_sync: Optional[datetime] = None
+
+
+async def sync_revoked_tokens():
+    """Pull revocations recorded since the last sync (e.g. by other workers) into the in-memory set."""
+    global _last_revocation_sync
+    started = now_utc()
+    where = {"expiresAt": {"gt": started}}
+    if _last_revocation_sync is not None:
+        where["createdAt"] = {"gte": _last_revocation_sync - timedelta(seconds=settings.JWT_REVOCATION_SYNC_SECONDS)}
+    rows = await client.revokedtoken.find_many(where=where)
+    token_verifier.load_revocations((r.jti, r.expiresAt.timestamp()) for r in rows)
+    _last_revocation_sync = started
+    return len(rows)
+
+
+async def revocation_sync_loop():
+    while True:
+        try:
+            await sync_revoked_tokens()
+            await client.revokedtoken.delete_many(where={"expiresAt": {"lt": now_utc()}})
+        except Exception:
+            logger.exception("Failed to sync revoked tokens")
+        await asyncio.sleep(settings.JWT_REVOCATION_SYNC_SECONDS)
+
+
 async def get_user_from_request(request):
     # Middleware may have set user
     user = getattr(request.state, "user", None)
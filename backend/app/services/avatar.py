@@ -1,19 +1,195 @@
 from __future__ import annotations
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from enum import Enum
 from typing import Any
+import httpx
+from app.core.config import settings
+from app.services.s3 import s3_service
+
+logger = logging.getLogger(__name__)
+
+
+def options_hash(options: dict | None) -> str:
+    canonical = json.dumps(options or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
 
 class AvatarService:
     """
-    Placeholder for an Avatar generation service.
-    Integrate with avatar generation APIs (e.g., DreamStudio, Avatar SDKs) here.
+    Client for the external avatar generation API.
+    The API receives the user id and generation options and responds with the rendered image bytes,
+    which are stored in S3. Pass `transport` in the config to talk to a local/fake server in tests.
     """
 
-    def __init__(self, config: dict | None = None):
+    def __init__(self, config: dict | None = None, storage=None):
         self.config = config or {}
+        self.storage = storage or s3_service
+        self.api_url = self.config.get("api_url", settings.AVATAR_API_URL)
+        self.api_key = self.config.get("api_key", settings.AVATAR_API_KEY)
+        self.timeout = self.config.get("timeout", settings.AVATAR_API_TIMEOUT_SECONDS)
+        self.transport = self.config.get("transport")
+
+    def object_name(self, user_id: int, options: dict | None) -> str:
+        return f"avatars/{user_id}/{options_hash(options)}.png"
+
+    async def cached_avatar(self, user_id: int, options: dict | None = None) -> str | None:
+        object_name = self.object_name(user_id, options)
+        if await asyncio.to_thread(self.storage.object_exists, object_name):
+            return self.storage.object_path(object_name)
+        return None
 
     async def generate_avatar(self, user_id: int, options: dict | None = None) -> Any:
         """
-        Generate an avatar for the user and return a URL or storage reference.
-        Not implemented yet.
+        Generate an avatar for the user and return its S3 path.
+        Results are cached in S3 by options hash, so repeated requests skip the external API.
         """
-        raise NotImplementedError("AvatarService.generate_avatar is not implemented")
+        cached = await self.cached_avatar(user_id, options)
+        if cached:
+            return cached
+        return await self._generate(user_id, options)
+
+    async def _generate(self, user_id: int, options: dict | None = None) -> str:
+        """Call the external API and store the result, without checking the S3 cache first."""
+        if not self.api_url:
+            raise RuntimeError("AVATAR_API_URL is not configured")
+
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        async with httpx.AsyncClient(timeout=self.timeout, transport=self.transport) as http:
+            response = await http.post(self.api_url, json={"user_id": user_id, "options": options or {}}, headers=headers)
+            response.raise_for_status()
+
+        object_name = self.object_name(user_id, options)
+        path = await asyncio.to_thread(self.storage.upload_file, io.BytesIO(response.content), object_name)
+        if not path:
+            raise RuntimeError("Failed to upload avatar")
+        return path
+
+
+class AvatarJobLimitError(Exception):
+    pass
+
+
+class AvatarJobStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+@dataclass
+class AvatarJob:
+    id: str
+    user_id: int
+    options: dict
+    options_hash: str
+    status: AvatarJobStatus = AvatarJobStatus.PENDING
+    result_path: str | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.monotonic)
+    finished_at: float | None = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (AvatarJobStatus.SUCCEEDED, AvatarJobStatus.FAILED)
+
+
+class AvatarJobQueue:
+    """
+    In-process queue of avatar generation jobs.
+    Identical (user_id, options) submissions coalesce onto the same job while it is pending, running or
+    succeeded; a failed job is replaced on the next submission. Finished jobs are kept for `job_ttl` seconds
+    so clients can poll for the result, and at most `max_concurrent` generations run at once. Each user
+    may have at most `max_active_per_user` unfinished jobs; further submissions raise AvatarJobLimitError.
+    """
+
+    def __init__(
+        self,
+        service: AvatarService | None = None,
+        max_concurrent: int | None = None,
+        job_ttl: float | None = None,
+        max_active_per_user: int | None = None,
+    ):
+        self.service = service or AvatarService()
+        self.max_concurrent = max_concurrent or settings.AVATAR_MAX_CONCURRENT_JOBS
+        self.max_active_per_user = max_active_per_user or settings.AVATAR_MAX_ACTIVE_JOBS_PER_USER
+        self.job_ttl = job_ttl if job_ttl is not None else settings.AVATAR_JOB_TTL_SECONDS
+        self._jobs: dict[str, AvatarJob] = {}
+        self._by_key: dict[tuple[int, str], str] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._active_by_user: dict[int, int] = {}
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def submit(self, user_id: int, options: dict | None = None) -> AvatarJob:
+        self._prune()
+        options = options or {}
+        key = (user_id, options_hash(options))
+        existing = self._jobs.get(self._by_key.get(key, ""))
+        if existing and existing.status != AvatarJobStatus.FAILED:
+            return existing
+        if self._active_by_user.get(user_id, 0) >= self.max_active_per_user:
+            raise AvatarJobLimitError("Too many avatar jobs in progress")
+
+        job = AvatarJob(id=uuid.uuid4().hex, user_id=user_id, options=options, options_hash=key[1])
+        self._jobs[job.id] = job
+        self._by_key[key] = job.id
+        self._active_by_user[user_id] = self._active_by_user.get(user_id, 0) + 1
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> AvatarJob | None:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: AvatarJob, timeout: float) -> AvatarJob:
+        """Long-poll: return once the job has finished or `timeout` seconds have elapsed."""
+        if not job.finished and timeout > 0:
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    async def _run(self, job: AvatarJob):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        try:
+            # cache hits are served without waiting for a generation slot
+            job.result_path = await self.service.cached_avatar(job.user_id, job.options)
+            if job.result_path is None:
+                async with self._semaphore:
+                    job.status = AvatarJobStatus.RUNNING
+                    job.result_path = await self.service._generate(job.user_id, job.options)
+            job.status = AvatarJobStatus.SUCCEEDED
+        except Exception:
+            # details (which may include the internal API URL) stay in the log
+            logger.exception("Avatar job %s failed", job.id)
+            job.status = AvatarJobStatus.FAILED
+            job.error = "Avatar generation failed"
+        finally:
+            remaining = self._active_by_user.get(job.user_id, 1) - 1
+            if remaining > 0:
+                self._active_by_user[job.user_id] = remaining
+            else:
+                self._active_by_user.pop(job.user_id, None)
+            job.finished_at = time.monotonic()
+            job.done.set()
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.job_ttl
+        for job_id in [j.id for j in self._jobs.values() if j.finished_at is not None and j.finished_at < cutoff]:
+            job = self._jobs.pop(job_id)
+            key = (job.user_id, job.options_hash)
+            if self._by_key.get(key) == job_id:
+                del self._by_key[key]
+
+
+avatar_jobs = AvatarJobQueue()
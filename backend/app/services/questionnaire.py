@@ -3,6 +3,22 @@ from app.api.v1.schemas.questionnaire import QuestionType
 from prisma.models import QuestionnaireQuestion, QuestionnaireResponse
 from typing import List
 
+# Incremental aggregate updates; ON CONFLICT keeps them atomic under concurrent answers
+_INCREMENT_LIKERT_COUNT_SQL = """
+    INSERT INTO questionnaire_likert_counts (question_id, likert_value, count)
+    VALUES ($1, $2, 1)
+    ON CONFLICT (question_id, likert_value) DO UPDATE SET count = questionnaire_likert_counts.count + 1
+"""
+
+_INCREMENT_USER_SCORE_SQL = """
+    INSERT INTO questionnaire_user_scores (user_id, response_count, likert_sum, updated_at)
+    VALUES ($1, 1, $2, now())
+    ON CONFLICT (user_id) DO UPDATE SET
+        response_count = questionnaire_user_scores.response_count + 1,
+        likert_sum = questionnaire_user_scores.likert_sum + EXCLUDED.likert_sum,
+        updated_at = now()
+"""
+
 async def get_all_questions() -> List[QuestionnaireQuestion]:
     return await client.questionnairequestion.find_many()
 
@@ -20,11 +36,73 @@ async def save_response(
     likert_value: int | None = None, 
     audio_path: str | None = None
 ) -> QuestionnaireResponse:
-    return await client.questionnaireresponse.create(
-        data={
-            "userId": user_id,
-            "questionId": question_id,
-            "likertValue": likert_value,
-            "audioPath": audio_path
-        }
-    )
+    async with client.tx() as tx:
+        response = await tx.questionnaireresponse.create(
+            data={
+                "userId": user_id,
+                "questionId": question_id,
+                "likertValue": likert_value,
+                "audioPath": audio_path
+            }
+        )
+        if likert_value is not None:
+            await tx.execute_raw(_INCREMENT_LIKERT_COUNT_SQL, question_id, likert_value)
+            await tx.execute_raw(_INCREMENT_USER_SCORE_SQL, user_id, likert_value)
+    return response
+
+async def get_likert_distributions() -> list[dict]:
+    """Per-question Likert distributions read from the aggregate table (O(questions), not O(responses))."""
+    questions = await client.questionnairequestion.find_many(where={"type": QuestionType.LIKERT})
+    counts = await client.questionnairelikertcount.find_many()
+
+    by_question: dict[str, dict[int, int]] = {}
+    for c in counts:
+        by_question.setdefault(c.questionId, {})[c.likertValue] = c.count
+
+    out = []
+    for q in questions:
+        distribution = by_question.get(q.id, {})
+        total = sum(distribution.values())
+        mean = sum(v * n for v, n in distribution.items()) / total if total else None
+        out.append({
+            "question_id": q.id,
+            "question": q.text,
+            "counts": dict(sorted(distribution.items())),
+            "total": total,
+            "mean": mean,
+        })
+    return out
+
+async def get_user_score(user_id: int) -> dict:
+    score = await client.questionnaireuserscore.find_unique(where={"userId": user_id})
+    response_count = score.responseCount if score else 0
+    likert_sum = score.likertSum if score else 0
+    return {
+        "user_id": user_id,
+        "response_count": response_count,
+        "likert_sum": likert_sum,
+        "mean": likert_sum / response_count if response_count else None,
+    }
+
+async def rebuild_aggregates():
+    """
+    Recompute the aggregate tables from all responses (one-off backfill or repair).
+    Run via `python scripts/backfill_aggregates.py`. The tables are locked first so answers saved
+    concurrently wait and then increment the rebuilt counts instead of being lost or counted twice.
+    """
+    async with client.tx() as tx:
+        await tx.execute_raw("LOCK TABLE questionnaire_likert_counts, questionnaire_user_scores IN EXCLUSIVE MODE")
+        await tx.execute_raw("DELETE FROM questionnaire_likert_counts")
+        await tx.execute_raw("DELETE FROM questionnaire_user_scores")
+        await tx.execute_raw("""
+            INSERT INTO questionnaire_likert_counts (question_id, likert_value, count)
+            SELECT question_id, "likertValue", COUNT(*) FROM "QuestionnaireResponse"
+            WHERE "likertValue" IS NOT NULL
+            GROUP BY question_id, "likertValue"
+        """)
+        await tx.execute_raw("""
+            INSERT INTO questionnaire_user_scores (user_id, response_count, likert_sum, updated_at)
+            SELECT user_id, COUNT(*), SUM("likertValue"), now() FROM "QuestionnaireResponse"
+            WHERE "likertValue" IS NOT NULL
+            GROUP BY user_id
+        """)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from app.core.config import settings
+from app.db import client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    retry_after: float = 0.0
+
+
+class InMemoryRateLimitBackend:
+    """
+    Per-process token buckets. Each key maps to (tokens, last_refill) and is refilled lazily on access,
+    so a check is a dict lookup plus a little arithmetic. The number of tracked keys is bounded; the
+    least recently used buckets are dropped first (a dropped bucket simply starts full again).
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def consume(self, key: str, capacity: int, refill_per_second: float, cost: int = 1) -> RateLimitResult:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = float(capacity)
+        else:
+            tokens = min(float(capacity), bucket[0] + (now - bucket[1]) * refill_per_second)
+            self._buckets.move_to_end(key)
+
+        if tokens >= cost:
+            self._buckets[key] = (tokens - cost, now)
+            result = RateLimitResult(allowed=True)
+        else:
+            self._buckets[key] = (tokens, now)
+            result = RateLimitResult(allowed=False, retry_after=(cost - tokens) / refill_per_second)
+
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return result
+
+    async def purge_stale(self, max_idle_seconds: float) -> int:
+        # The in-memory backend is already bounded by max_keys; nothing to purge
+        return 0
+
+    def reset(self):
+        self._buckets.clear()
+
+
+class PostgresRateLimitBackend:
+    """
+    Token buckets shared by every worker, stored in the `rate_limit_buckets` table (model RateLimitBucket).
+    Refill and consumption happen in a single atomic upsert so concurrent workers cannot double-spend.
+    """
+
+    _CONSUME_SQL = """
+        INSERT INTO rate_limit_buckets AS b (key, tokens, allowed, updated_at)
+        VALUES ($1, $2::float8 - $4::float8, true, LOCALTIMESTAMP)
+        ON CONFLICT (key) DO UPDATE SET
+            allowed = LEAST($2::float8, b.tokens + EXTRACT(EPOCH FROM (LOCALTIMESTAMP - b.updated_at)) * $3::float8) >= $4::float8,
+            tokens = CASE
+                WHEN LEAST($2::float8, b.tokens + EXTRACT(EPOCH FROM (LOCALTIMESTAMP - b.updated_at)) * $3::float8) >= $4::float8
+                THEN LEAST($2::float8, b.tokens + EXTRACT(EPOCH FROM (LOCALTIMESTAMP - b.updated_at)) * $3::float8) - $4::float8
+                ELSE LEAST($2::float8, b.tokens + EXTRACT(EPOCH FROM (LOCALTIMESTAMP - b.updated_at)) * $3::float8)
+            END,
+            updated_at = LOCALTIMESTAMP
+        RETURNING tokens, allowed
+    """
+
+    _PURGE_SQL = """
+        DELETE FROM rate_limit_buckets
+        WHERE updated_at < LOCALTIMESTAMP - make_interval(secs => $1::float8)
+    """
+
+    def __init__(self, db=None):
+        self.db = db or client
+
+    async def consume(self, key: str, capacity: int, refill_per_second: float, cost: int = 1) -> RateLimitResult:
+        row = await self.db.query_first(self._CONSUME_SQL, key, float(capacity), float(refill_per_second), float(cost))
+        if not row or row.get("allowed"):
+            return RateLimitResult(allowed=True)
+        tokens = float(row.get("tokens") or 0.0)
+        return RateLimitResult(allowed=False, retry_after=max(0.0, (cost - tokens) / refill_per_second))
+
+    async def purge_stale(self, max_idle_seconds: float) -> int:
+        """Delete buckets idle long enough to have refilled completely; they are equivalent to no row."""
+        return await self.db.execute_raw(self._PURGE_SQL, float(max_idle_seconds))
+
+    def reset(self):
+        # Shared state lives in the database; nothing to clear locally
+        return None
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with a pluggable backend.
+    `per_minute` is the sustained rate and `burst` the bucket capacity.
+    """
+
+    def __init__(self, backend=None, enabled: bool = True):
+        self.backend = backend or InMemoryRateLimitBackend()
+        self.enabled = enabled
+
+    async def hit(self, key: str, per_minute: int, burst: int, cost: int = 1) -> RateLimitResult:
+        if not self.enabled or per_minute <= 0:
+            return RateLimitResult(allowed=True)
+        try:
+            return await self.backend.consume(key, max(burst, cost), per_minute / 60.0, cost)
+        except Exception:
+            # Fail open: a backend outage (e.g. DB errors, pool exhaustion) must not take down every endpoint
+            logger.exception("Rate limit backend failed; allowing request for %s", key)
+            return RateLimitResult(allowed=True)
+
+    async def purge_stale(self, max_idle_seconds: float) -> int:
+        return await self.backend.purge_stale(max_idle_seconds)
+
+    def reset(self):
+        self.backend.reset()
+
+
+def create_backend(name: str | None = None):
+    name = (name or settings.RATE_LIMIT_BACKEND or "memory").lower()
+    if name == "memory":
+        return InMemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+    if name == "postgres":
+        return PostgresRateLimitBackend()
+    raise ValueError(f"Unknown rate limit backend: {name}")
+
+
+def full_refill_seconds() -> float:
+    """Longest time any configured bucket takes to refill from empty; idle rows older than this are full."""
+    limits = [
+        (settings.RATE_LIMIT_PER_MINUTE, settings.RATE_LIMIT_BURST),
+        (settings.AUTH_RATE_LIMIT_PER_MINUTE, settings.AUTH_RATE_LIMIT_BURST),
+        (settings.LOGIN_USERNAME_RATE_LIMIT_PER_MINUTE, settings.LOGIN_USERNAME_RATE_LIMIT_BURST),
+    ]
+    return max((burst / (per_minute / 60.0) for per_minute, burst in limits if per_minute > 0), default=0.0)
+
+
+def client_ip(request) -> str:
+    # Each trusted proxy appends the address it received the request from, so the client is the
+    # entry `RATE_LIMIT_TRUSTED_PROXIES` positions from the right. Entries further left are set by
+    # the client and cannot be trusted.
+    hops = settings.RATE_LIMIT_TRUSTED_PROXIES
+    if hops > 0:
+        forwarded = [e.strip() for e in request.headers.get("x-forwarded-for", "").split(",") if e.strip()]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.client.host if request.client else "unknown"
+
+
+async def rate_limit_cleanup_loop():
+    while True:
+        await asyncio.sleep(settings.RATE_LIMIT_CLEANUP_SECONDS)
+        try:
+            await rate_limiter.purge_stale(full_refill_seconds())
+        except Exception:
+            logger.exception("Failed to purge stale rate limit buckets")
+
+
+rate_limiter = RateLimiter(create_backend(), enabled=settings.RATE_LIMIT_ENABLED)
@@ -1,6 +1,7 @@
 import boto3
-from botocore.exceptions import NoCredentialsError
+from botocore.exceptions import ClientError, NoCredentialsError
 from app.core.config import settings
+from app.core.tracing import traced
 
 class S3Service:
     def __init__(self):
@@ -20,6 +21,7 @@ class S3Service:
             endpoint_url=endpoint
         )
 
+    @traced("s3.upload_file")
     def upload_file(self, file_obj, object_name: str) -> str | None:
         """
         Upload a file to an S3 bucket
@@ -29,7 +31,7 @@ class S3Service:
         """
         try:
             self.s3.upload_fileobj(file_obj, self.bucket_name, object_name)
-            return f"s3://{self.bucket_name}/{object_name}"
+            return self.object_path(object_name)
         except NoCredentialsError:
             print("Credentials not available")
             return None
@@ -37,4 +39,23 @@ class S3Service:
             print(f"Error uploading file: {e}")
             return None
 
+    @traced("s3.object_exists")
+    def object_exists(self, object_name: str) -> bool:
+        """
+        Check whether an object exists in the bucket
+        :param object_name: S3 object name
+        :return: True if the object exists
+        """
+        try:
+            self.s3.head_object(Bucket=self.bucket_name, Key=object_name)
+            return True
+        except ClientError:
+            return False
+        except Exception as e:
+            print(f"Error checking object: {e}")
+            return False
+
+    def object_path(self, object_name: str) -> str:
+        return f"s3://{self.bucket_name}/{object_name}"
+
 s3_service = S3Service()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from app.core.config import settings
+from app.db import client
+
+
+def estimate_tokens(text: str) -> int:
+    # Rough estimate (~4 characters per token); avoids depending on a specific tokenizer
+    return (len(text) + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return text[: max_tokens * 4 - 1].rstrip() + "…"
+
+
+@dataclass
+class CachedContext:
+    """The per-user part of a twin prompt that only changes with a new persona snapshot or theme summary."""
+    user_id: int
+    snapshot_version: int | None
+    persona: str
+    themes: list[str] = field(default_factory=list)
+    tokens: int = 0
+    built_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class TwinContext:
+    static: CachedContext
+    memories: list[str]
+    tokens: int
+
+    def render(self) -> str:
+        sections = []
+        if self.static.persona:
+            sections.append(f"Persona:\n{self.static.persona}")
+        if self.static.themes:
+            sections.append("Themes:\n" + "\n".join(f"- {t}" for t in self.static.themes))
+        if self.memories:
+            sections.append("Relevant memories:\n" + "\n".join(f"- {m}" for m in self.memories))
+        return "\n\n".join(sections)
+
+
+class TwinContextService:
+    """
+    Assembles prompt context for twin conversations.
+    The persona snapshot and theme summaries are loaded and truncated to the token budget once per
+    snapshot version and cached per user, so a steady-state turn costs a single vector query.
+    Call `on_snapshot_created` / `on_theme_summary_created` when new data lands to invalidate the cache;
+    entries also expire after `ttl` seconds, which bounds staleness when data is written by another
+    process. Memory chunks are retrieved fresh on every turn and are not cached. Memory chunk payloads
+    in the vector DB are expected to carry `user_id` and `content`.
+    """
+
+    def __init__(self, vector_db=None, db=None, config: dict | None = None):
+        self.config = config or {}
+        self._vector_db = vector_db
+        self.db = db or client
+        self.token_budget = self.config.get("token_budget", settings.TWIN_CONTEXT_TOKEN_BUDGET)
+        self.memory_tokens = self.config.get("memory_tokens", settings.TWIN_CONTEXT_MEMORY_TOKENS)
+        self.top_k = self.config.get("top_k", settings.TWIN_CONTEXT_TOP_K)
+        self.max_entries = self.config.get("cache_size", settings.TWIN_CONTEXT_CACHE_SIZE)
+        self.ttl = self.config.get("ttl", settings.TWIN_CONTEXT_TTL_SECONDS)
+        self._cache: OrderedDict[int, CachedContext] = OrderedDict()
+        self._building: dict[int, asyncio.Task] = {}
+        # bumped on invalidation so a build racing with new data does not populate the cache
+        self._generation: dict[int, int] = {}
+
+    @property
+    def vector_db(self):
+        if self._vector_db is None:
+            from app.services.vector_db import VectorDB
+            self._vector_db = VectorDB()
+        return self._vector_db
+
+    async def get_static(self, user_id: int) -> CachedContext:
+        cached = self._cache.get(user_id)
+        if cached is not None:
+            if time.monotonic() - cached.built_at < self.ttl:
+                self._cache.move_to_end(user_id)
+                return cached
+            del self._cache[user_id]
+        # concurrent turns for the same user share one build
+        task = self._building.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self._build(user_id))
+            self._building[user_id] = task
+            task.add_done_callback(lambda t: self._building.pop(user_id, None) if self._building.get(user_id) is t else None)
+        return await asyncio.shield(task)
+
+    async def assemble(self, user_id: int, query_vector: list[float]) -> TwinContext:
+        static = await self.get_static(user_id)
+        hits = await self.vector_db.query(query_vector, top_k=self.top_k, filters={"user_id": user_id})
+
+        remaining = self.token_budget - static.tokens
+        memories = []
+        for hit in hits:
+            content = (hit.get("payload") or {}).get("content")
+            if not content:
+                continue
+            cost = estimate_tokens(content)
+            if cost > remaining:
+                break
+            memories.append(content)
+            remaining -= cost
+        return TwinContext(static=static, memories=memories, tokens=self.token_budget - remaining)
+
+    def on_snapshot_created(self, user_id: int, version: int | None = None):
+        cached = self._cache.get(user_id)
+        # With nothing cached a build may be in flight and have read the previous snapshot, so always
+        # invalidate; a cached entry is only dropped if it is older than the new snapshot.
+        if cached is None or version is None or cached.snapshot_version is None or cached.snapshot_version < version:
+            self.invalidate(user_id)
+
+    def on_theme_summary_created(self, user_id: int):
+        self.invalidate(user_id)
+
+    def invalidate(self, user_id: int):
+        self._cache.pop(user_id, None)
+        self._building.pop(user_id, None)
+        self._generation[user_id] = self._generation.get(user_id, 0) + 1
+
+    async def _build(self, user_id: int) -> CachedContext:
+        generation = self._generation.get(user_id, 0)
+        snapshot = await self.db.personasnapshot.find_first(
+            where={"userId": user_id}, order={"version": "desc"}
+        )
+        themes = await self.db.themesummary.find_many(
+            where={"userId": user_id}, order={"createdAt": "desc"}
+        )
+
+        budget = max(0, self.token_budget - self.memory_tokens)
+        persona = truncate_to_tokens(snapshot.summary, budget) if snapshot else ""
+        used = estimate_tokens(persona)
+
+        # newest summary per theme, until the static budget is spent
+        seen = set()
+        theme_lines = []
+        for t in themes:
+            if t.theme in seen or used >= budget:
+                continue
+            seen.add(t.theme)
+            line = truncate_to_tokens(f"{t.theme}: {t.summary}", budget - used)
+            theme_lines.append(line)
+            used += estimate_tokens(line)
+
+        context = CachedContext(
+            user_id=user_id,
+            snapshot_version=snapshot.version if snapshot else None,
+            persona=persona,
+            themes=theme_lines,
+            tokens=used,
+        )
+        if self._generation.get(user_id, 0) == generation:
+            self._cache[user_id] = context
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return context
+
+
+twin_context = TwinContextService()
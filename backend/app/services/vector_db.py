@@ -1,8 +1,9 @@
 from typing import Any, Optional
 import asyncio
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import PointStruct, Distance
+from qdrant_client.http.models import PointStruct, Distance, Filter, FieldCondition, MatchValue
 from app.core.config import settings
+from app.core.tracing import traced
 
 
 class VectorDB:
@@ -24,12 +25,18 @@ class VectorDB:
             # create collection with default cosine distance
             self.client.recreate_collection(collection_name=self.collection_name, vectors={"size": self.vector_size, "distance": Distance.COSINE})
 
+    @traced("vector_db.upsert_vectors")
     async def upsert_vectors(self, vectors: list[dict]):
         points = [PointStruct(id=v["id"], vector=v["vector"], payload=v.get("payload")) for v in vectors]
         await asyncio.to_thread(self.client.upsert, collection_name=self.collection_name, points=points)
 
-    async def query(self, query_vector: list[float], top_k: int = 10) -> list[dict]:
-        results = await asyncio.to_thread(self.client.search, collection_name=self.collection_name, query_vector=query_vector, limit=top_k)
+    @traced("vector_db.query")
+    async def query(self, query_vector: list[float], top_k: int = 10, filters: Optional[dict] = None) -> list[dict]:
+        # filters: payload equality conditions, e.g. {"user_id": 1}
+        query_filter = None
+        if filters:
+            query_filter = Filter(must=[FieldCondition(key=k, match=MatchValue(value=v)) for k, v in filters.items()])
+        results = await asyncio.to_thread(self.client.search, collection_name=self.collection_name, query_vector=query_vector, query_filter=query_filter, limit=top_k)
         # Convert results to simple dicts
         out = []
         for r in results:
@@ -0,0 +1,27 @@
+"""
+Recompute questionnaire analytics aggregates from all stored responses.
+
+Run once after applying the migration that adds the aggregate tables, and any time they need repair:
+    python scripts/backfill_aggregates.py
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import client
+from app.services import questionnaire as questionnaire_service
+
+
+async def main():
+    await client.connect()
+    try:
+        await questionnaire_service.rebuild_aggregates()
+    finally:
+        await client.disconnect()
+    print("Questionnaire aggregates rebuilt.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
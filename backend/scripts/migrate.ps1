@@ -12,3 +12,4 @@ prisma generate
 prisma migrate deploy
 
 Write-Host "Migrations applied."
+Write-Host "If this migration created the questionnaire aggregate tables, backfill them with: python scripts/backfill_aggregates.py"
@@ -12,3 +12,4 @@ prisma generate
 prisma migrate deploy
 
 echo "Migrations applied."
+echo "If this migration created the questionnaire aggregate tables, backfill them with: python scripts/backfill_aggregates.py"
@@ -0,0 +1,95 @@
+import asyncio
+import httpx
+import pytest
+from pydantic import ValidationError
+from app.api.v1.schemas.avatar import AvatarJobCreate
+from app.services.avatar import AvatarService, AvatarJobQueue, AvatarJobStatus, AvatarJobLimitError
+
+
+class FakeStorage:
+    def __init__(self):
+        self.objects = {}
+        self.exists_calls = 0
+
+    def object_exists(self, object_name):
+        self.exists_calls += 1
+        return object_name in self.objects
+
+    def object_path(self, object_name):
+        return f"s3://test/{object_name}"
+
+    def upload_file(self, file_obj, object_name):
+        self.objects[object_name] = file_obj.read()
+        return self.object_path(object_name)
+
+
+def fake_avatar_server(calls):
+    async def handler(request: httpx.Request):
+        calls.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, content=b"PNG")
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_identical_jobs_coalesce_and_results_are_cached():
+    calls = []
+    storage = FakeStorage()
+    service = AvatarService({"api_url": "http://avatar.local/generate", "transport": fake_avatar_server(calls)}, storage=storage)
+    queue = AvatarJobQueue(service, max_concurrent=2, job_ttl=60)
+
+    first = queue.submit(1, {"style": "cartoon", "size": 256})
+    second = queue.submit(1, {"size": 256, "style": "cartoon"})
+    assert first is second
+
+    job = await queue.wait(first, timeout=5)
+    assert job.status == AvatarJobStatus.SUCCEEDED
+    assert job.result_path == f"s3://test/avatars/1/{job.options_hash}.png"
+    assert len(calls) == 1
+    assert storage.exists_calls == 1
+
+    # A fresh queue (e.g. after a restart) is served from the S3 cache
+    other = AvatarJobQueue(service, max_concurrent=2, job_ttl=60)
+    cached = await other.wait(other.submit(1, {"style": "cartoon", "size": 256}), timeout=5)
+    assert cached.status == AvatarJobStatus.SUCCEEDED
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_replaced_on_resubmit():
+    async def broken(request):
+        return httpx.Response(500)
+
+    service = AvatarService({"api_url": "http://avatar.local/generate", "transport": httpx.MockTransport(broken)}, storage=FakeStorage())
+    queue = AvatarJobQueue(service, max_concurrent=1, job_ttl=60)
+
+    job = await queue.wait(queue.submit(1, {}), timeout=5)
+    assert job.status == AvatarJobStatus.FAILED
+    assert job.error == "Avatar generation failed"
+    assert "avatar.local" not in job.error
+    assert queue.submit(1, {}) is not job
+
+
+@pytest.mark.asyncio
+async def test_active_jobs_are_capped_per_user():
+    service = AvatarService({"api_url": "http://avatar.local/generate", "transport": fake_avatar_server([])}, storage=FakeStorage())
+    queue = AvatarJobQueue(service, max_concurrent=1, job_ttl=60, max_active_per_user=2)
+
+    first = queue.submit(1, {"n": 1})
+    second = queue.submit(1, {"n": 2})
+    with pytest.raises(AvatarJobLimitError):
+        queue.submit(1, {"n": 3})
+    # identical submissions coalesce and other users are unaffected
+    assert queue.submit(1, {"n": 1}) is first
+    queue.submit(2, {"n": 1})
+
+    await queue.wait(first, timeout=5)
+    await queue.wait(second, timeout=5)
+    assert queue.submit(1, {"n": 3}).status == AvatarJobStatus.PENDING
+
+
+def test_job_options_size_is_limited():
+    AvatarJobCreate(options={"style": "cartoon"})
+    with pytest.raises(ValidationError):
+        AvatarJobCreate(options={"prompt": "x" * 100_000})
@@ -0,0 +1,79 @@
+import time
+import jwt
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from httpx import AsyncClient
+from app.core.utils.jwt import TokenVerifier, RevokedTokenError, token_verifier
+from app.services import auth as auth_service
+
+
+def test_verifier_caches_claims_until_exp():
+    verifier = TokenVerifier("secret", "HS256", max_entries=2)
+    token = jwt.encode({"user_id": 1, "jti": "a", "exp": int(time.time()) + 60}, "secret", algorithm="HS256")
+    first = verifier.verify(token)
+    assert verifier.verify(token) is first
+
+    expired = jwt.encode({"user_id": 1, "jti": "b", "exp": int(time.time()) + 60}, "secret", algorithm="HS256")
+    verifier.verify(expired)
+    verifier._cache[expired]["exp"] = time.time() - 1
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verifier.verify(expired)
+    assert expired not in verifier._cache
+
+
+def test_verifier_rejects_revoked_tokens():
+    verifier = TokenVerifier("secret", "HS256")
+    token = jwt.encode({"user_id": 1, "jti": "a", "exp": int(time.time()) + 60}, "secret", algorithm="HS256")
+    verifier.verify(token)
+    verifier.load_revocations([("a", time.time() + 60), ("old", time.time() - 60)])
+    with pytest.raises(RevokedTokenError):
+        verifier.verify(token)
+    assert not verifier.is_revoked("old")
+
+
+@pytest.mark.asyncio
+async def test_user_is_served_from_token_claims(monkeypatch):
+    user = SimpleNamespace(
+        id=7,
+        username="jdoe",
+        gender="m",
+        birthdate=datetime(1990, 1, 1, tzinfo=timezone.utc),
+        createdAt=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+    token = auth_service.create_token_for_user(user, expires_delta=timedelta(minutes=5))
+
+    async def fail_find_unique(where):
+        raise AssertionError("DB lookup should not be needed")
+
+    monkeypatch.setattr(auth_service, "client", SimpleNamespace(user=SimpleNamespace(find_unique=fail_find_unique)))
+    try:
+        current = await auth_service.get_user_from_token(token)
+        assert current.id == 7
+        assert current.username == "jdoe"
+        assert current.birthdate == date(1990, 1, 1)
+
+        token_verifier.revoke(jwt.decode(token, options={"verify_signature": False})["jti"], time.time() + 60)
+        assert await auth_service.get_user_from_token(token) is None
+    finally:
+        token_verifier.clear()
+
+
+@pytest.mark.asyncio
+async def test_logout_clears_cookie_when_revoke_fails(monkeypatch):
+    async def _noop():
+        return None
+
+    from app import db as db_module
+    from app.main import app
+    monkeypatch.setattr(db_module.client, "connect", _noop)
+    monkeypatch.setattr(db_module.client, "disconnect", _noop)
+
+    async def failing_revoke(token):
+        raise ConnectionError("db down")
+
+    monkeypatch.setattr(auth_service, "revoke_token", failing_revoke)
+    async with AsyncClient(app=app, base_url="http://test", cookies={"access_token": "t"}) as ac:
+        r = await ac.post("/api/v1/auth/logout")
+    assert r.status_code == 200
+    assert 'access_token=""' in r.headers["set-cookie"]
@@ -0,0 +1,84 @@
+import pytest
+from types import SimpleNamespace
+from app.services import questionnaire as questionnaire_service
+
+
+class FakeTx:
+    def __init__(self, db):
+        self.db = db
+        self.questionnaireresponse = db
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_raw(self, query, *args):
+        self.db.raw.append((query, args))
+        return 1
+
+
+class FakeClient:
+    def __init__(self, questions=(), counts=(), score=None):
+        self.raw = []
+        self.created = []
+        self.questionnairequestion = SimpleNamespace(find_many=self._returning(list(questions)))
+        self.questionnairelikertcount = SimpleNamespace(find_many=self._returning(list(counts)))
+        self.questionnaireuserscore = SimpleNamespace(find_unique=self._returning(score))
+
+    @staticmethod
+    def _returning(value):
+        async def call(**kwargs):
+            return value
+        return call
+
+    def tx(self):
+        return FakeTx(self)
+
+    async def create(self, data):
+        self.created.append(data)
+        return SimpleNamespace(id="r1", **data)
+
+
+@pytest.mark.asyncio
+async def test_save_response_updates_aggregates_only_for_likert(monkeypatch):
+    fake = FakeClient()
+    monkeypatch.setattr(questionnaire_service, "client", fake)
+
+    await questionnaire_service.save_response(user_id=1, question_id="q1", audio_path="s3://b/a.wav")
+    assert len(fake.created) == 1
+    assert fake.raw == []
+
+    await questionnaire_service.save_response(user_id=1, question_id="q1", likert_value=4)
+    assert len(fake.created) == 2
+    queries = [q for q, _ in fake.raw]
+    assert "questionnaire_likert_counts" in queries[0] and "questionnaire_user_scores" in queries[1]
+    assert [args for _, args in fake.raw] == [("q1", 4), (1, 4)]
+
+
+@pytest.mark.asyncio
+async def test_likert_distributions_from_aggregates(monkeypatch):
+    questions = [SimpleNamespace(id="q1", text="I enjoy crowds"), SimpleNamespace(id="q2", text="I plan ahead")]
+    counts = [
+        SimpleNamespace(questionId="q1", likertValue=5, count=1),
+        SimpleNamespace(questionId="q1", likertValue=2, count=3),
+    ]
+    monkeypatch.setattr(questionnaire_service, "client", FakeClient(questions=questions, counts=counts))
+
+    first, empty = await questionnaire_service.get_likert_distributions()
+    assert first["counts"] == {2: 3, 5: 1}
+    assert first["total"] == 4
+    assert first["mean"] == pytest.approx(11 / 4)
+    assert empty == {"question_id": "q2", "question": "I plan ahead", "counts": {}, "total": 0, "mean": None}
+
+
+@pytest.mark.asyncio
+async def test_user_score(monkeypatch):
+    score = SimpleNamespace(responseCount=4, likertSum=14)
+    monkeypatch.setattr(questionnaire_service, "client", FakeClient(score=score))
+    result = await questionnaire_service.get_user_score(1)
+    assert result == {"user_id": 1, "response_count": 4, "likert_sum": 14, "mean": 3.5}
+
+    monkeypatch.setattr(questionnaire_service, "client", FakeClient(score=None))
+    assert await questionnaire_service.get_user_score(2) == {"user_id": 2, "response_count": 0, "likert_sum": 0, "mean": None}
@@ -0,0 +1,167 @@
+import pytest
+from types import SimpleNamespace
+from httpx import AsyncClient
+from app.main import app
+from app.services.rate_limit import (
+    InMemoryRateLimitBackend,
+    PostgresRateLimitBackend,
+    RateLimiter,
+    client_ip,
+    rate_limiter,
+)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_blocks():
+    limiter = RateLimiter(InMemoryRateLimitBackend())
+    results = [await limiter.hit("ip:1.2.3.4", per_minute=60, burst=3) for _ in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert 0 < results[-1].retry_after <= 1.0
+    # Other keys have their own bucket
+    assert (await limiter.hit("ip:5.6.7.8", per_minute=60, burst=3)).allowed
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_is_bounded():
+    backend = InMemoryRateLimitBackend(max_keys=2)
+    for key in ("a", "b", "c"):
+        await backend.consume(key, capacity=1, refill_per_second=1.0)
+    assert list(backend._buckets) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_login_is_throttled_per_username(monkeypatch):
+    async def _noop():
+        return None
+
+    from app import db as db_module
+    monkeypatch.setattr(db_module.client, "connect", _noop)
+    monkeypatch.setattr(db_module.client, "disconnect", _noop)
+
+    from app.core.config import settings
+    from app.services import auth as auth_service
+    monkeypatch.setattr(settings, "LOGIN_USERNAME_RATE_LIMIT_BURST", 2)
+
+    calls = []
+
+    async def fake_auth(login_in):
+        calls.append(login_in.username)
+        return None
+
+    monkeypatch.setattr(auth_service, "authenticate_user", fake_auth)
+    rate_limiter.reset()
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            codes = [
+                (await ac.post("/api/v1/auth/login", json={"username": "victim", "password": "x"})).status_code
+                for _ in range(3)
+            ]
+        assert codes == [401, 401, 429]
+        # The throttled attempt never reached the password check
+        assert calls == ["victim", "victim"]
+    finally:
+        rate_limiter.reset()
+
+
+def make_request(forwarded=None, host="10.0.0.1"):
+    headers = {"x-forwarded-for": forwarded} if forwarded is not None else {}
+    return SimpleNamespace(headers=headers, client=SimpleNamespace(host=host))
+
+
+def test_client_ip_ignores_spoofed_forwarded_entries(monkeypatch):
+    from app.core.config import settings
+
+    # Without trusted proxies the header is ignored entirely
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", 0)
+    assert client_ip(make_request("6.6.6.6")) == "10.0.0.1"
+
+    # Behind one proxy, client-supplied entries to the left of the proxy's entry are ignored
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", 1)
+    spoofed = {client_ip(make_request(f"6.6.6.{i}, 203.0.113.7")) for i in range(5)}
+    assert spoofed == {"203.0.113.7"}
+
+    # Behind two proxies the client is the second entry from the right
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", 2)
+    assert client_ip(make_request("6.6.6.6, 203.0.113.7, 172.16.0.2")) == "203.0.113.7"
+    # A header shorter than the proxy chain is not trusted
+    assert client_ip(make_request("6.6.6.6")) == "10.0.0.1"
+
+
+class FakeDB:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.queries = []
+        self.executed = []
+
+    async def query_first(self, query, *args):
+        self.queries.append(args)
+        return self.rows.pop(0)
+
+    async def execute_raw(self, query, *args):
+        self.executed.append((query, args))
+        return 3
+
+
+@pytest.mark.asyncio
+async def test_postgres_backend_maps_upsert_result():
+    db = FakeDB([{"tokens": 2.0, "allowed": True}, {"tokens": 0.25, "allowed": False}])
+    limiter = RateLimiter(PostgresRateLimitBackend(db))
+
+    allowed = await limiter.hit("ip:1.2.3.4", per_minute=60, burst=3)
+    denied = await limiter.hit("ip:1.2.3.4", per_minute=60, burst=3)
+    assert allowed.allowed
+    assert not denied.allowed
+    assert denied.retry_after == pytest.approx(0.75)
+    # key, capacity, refill per second, cost
+    assert db.queries[0] == ("ip:1.2.3.4", 3.0, 1.0, 1.0)
+
+
+@pytest.mark.asyncio
+async def test_postgres_backend_purges_idle_buckets():
+    db = FakeDB([])
+    limiter = RateLimiter(PostgresRateLimitBackend(db))
+
+    assert await limiter.purge_stale(120) == 3
+    query, args = db.executed[0]
+    assert "DELETE FROM rate_limit_buckets" in query
+    assert args == (120.0,)
+
+
+def test_full_refill_seconds_covers_slowest_bucket(monkeypatch):
+    from app.core.config import settings
+    from app.services.rate_limit import full_refill_seconds
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_PER_MINUTE", 300)
+    monkeypatch.setattr(settings, "RATE_LIMIT_BURST", 100)
+    monkeypatch.setattr(settings, "AUTH_RATE_LIMIT_PER_MINUTE", 20)
+    monkeypatch.setattr(settings, "AUTH_RATE_LIMIT_BURST", 10)
+    monkeypatch.setattr(settings, "LOGIN_USERNAME_RATE_LIMIT_PER_MINUTE", 5)
+    monkeypatch.setattr(settings, "LOGIN_USERNAME_RATE_LIMIT_BURST", 5)
+    assert full_refill_seconds() == pytest.approx(60.0)
+
+
+class FailingDB:
+    async def query_first(self, query, *args):
+        raise ConnectionError("connection pool exhausted")
+
+
+@pytest.mark.asyncio
+async def test_limiter_fails_open_when_backend_errors():
+    limiter = RateLimiter(PostgresRateLimitBackend(FailingDB()))
+    result = await limiter.hit("ip:1.2.3.4", per_minute=60, burst=3)
+    assert result.allowed
+
+
+@pytest.mark.asyncio
+async def test_health_survives_rate_limit_backend_outage(monkeypatch):
+    async def _noop():
+        return None
+
+    from app import db as db_module
+    monkeypatch.setattr(db_module.client, "connect", _noop)
+    monkeypatch.setattr(db_module.client, "disconnect", _noop)
+    monkeypatch.setattr(rate_limiter, "backend", PostgresRateLimitBackend(FailingDB()))
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.get("/api/v1/health")
+    assert r.status_code == 200
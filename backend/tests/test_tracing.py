@@ -0,0 +1,105 @@
+import asyncio
+import io
+import json
+import threading
+import time
+import pytest
+from app.core.tracing import Tracer, FileExporter, ConsoleExporter
+from app.core.profiling import SamplingProfiler
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_across_threads_and_export_to_file(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(enabled=True, exporter=FileExporter(str(path)))
+
+    def blocking_call():
+        with tracer.span("s3.upload_file"):
+            time.sleep(0.01)
+
+    with tracer.span("http.request", path="/x") as root:
+        await asyncio.to_thread(blocking_call)
+
+    child, parent = [json.loads(line) for line in path.read_text().splitlines()]
+    assert parent["name"] == "http.request" and parent["parent_id"] is None
+    assert child["parent_id"] == root.span_id
+    assert child["trace_id"] == root.trace_id
+    assert child["duration_ms"] >= 10
+
+
+def test_disabled_tracer_exports_nothing(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(enabled=False, exporter=FileExporter(str(path)))
+    with tracer.span("noop") as span:
+        span.set_attribute("status_code", 200)
+    assert not path.exists()
+    # the shared no-op span must not accumulate attributes across requests
+    assert span.attributes == {}
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def sampler_threads():
+    return [t for t in threading.enumerate() if t.name == "sampling-profiler"]
+
+
+def test_sampling_profiler_writes_folded_stacks(tmp_path):
+    profiler = SamplingProfiler(interval=0.001)
+    started = profiler.begin()
+    busy(0.05)
+    stacks = profiler.end(started)
+
+    out = profiler.dump(stacks, str(tmp_path), "GET-/api/v1/auth/me")
+    assert out.endswith(".folded")
+    assert "busy (test_tracing.py" in open(out).read()
+    # dumps for the same request name never overwrite each other
+    assert profiler.dump(stacks, str(tmp_path), "GET-/api/v1/auth/me") != out
+
+
+def test_concurrent_requests_share_one_sampler_thread():
+    profiler = SamplingProfiler(interval=0.001)
+    first = profiler.begin()
+    busy(0.02)
+    second = profiler.begin()
+    assert len(sampler_threads()) == 1
+    busy(0.02)
+
+    second_stacks = profiler.end(second)
+    first_stacks = profiler.end(first)
+    # each request only gets the samples of its own window
+    assert 0 < len(second_stacks) < len(first_stacks)
+
+    # the sampler thread exits once no request is being profiled
+    time.sleep(0.05)
+    assert sampler_threads() == []
+
+
+def test_profiler_drops_samples_no_active_request_can_read():
+    profiler = SamplingProfiler(interval=0.001)
+    long_running = profiler.begin()
+    busy(0.02)
+    short = profiler.begin()
+    busy(0.02)
+    profiler.end(long_running)
+
+    # only the window of the request still in flight is kept, and identical stacks share one tuple
+    assert profiler._times and profiler._times[0] >= short
+    assert len({id(stack) for stack in profiler._stacks}) < len(profiler._stacks)
+    assert profiler.end(short)
+    assert profiler._times == [] and profiler._stacks == []
+
+
+def test_console_exporter_writes_without_logging_config():
+    out = io.StringIO()
+    tracer = Tracer(enabled=True, exporter=ConsoleExporter(out))
+    with tracer.span("http.request", path="/x"):
+        with tracer.span("db.query"):
+            pass
+
+    child, root = out.getvalue().splitlines()
+    assert child.startswith("  db.query ")
+    assert root.startswith("http.request ") and "'path': '/x'" in root
@@ -0,0 +1,134 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from app.services.twin_context import TwinContextService, estimate_tokens
+
+
+class FakeTable:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = 0
+
+    async def find_first(self, where, order):
+        self.calls += 1
+        rows = [r for r in self.rows if r.userId == where["userId"]]
+        return max(rows, key=lambda r: r.version) if rows else None
+
+    async def find_many(self, where, order):
+        self.calls += 1
+        return [r for r in reversed(self.rows) if r.userId == where["userId"]]
+
+
+class FakeVectorDB:
+    def __init__(self, hits):
+        self.hits = hits
+        self.queries = []
+
+    async def query(self, query_vector, top_k=10, filters=None):
+        self.queries.append(filters)
+        return self.hits
+
+
+def make_service(snapshots, themes, hits, **config):
+    db = SimpleNamespace(personasnapshot=FakeTable(snapshots), themesummary=FakeTable(themes))
+    return TwinContextService(vector_db=FakeVectorDB(hits), db=db, config=config), db
+
+
+@pytest.mark.asyncio
+async def test_steady_state_turn_only_queries_vectors():
+    snapshots = [SimpleNamespace(userId=1, version=1, summary="Calm and curious.")]
+    themes = [
+        SimpleNamespace(userId=1, theme="childhood", summary="old"),
+        SimpleNamespace(userId=1, theme="childhood", summary="Grew up near the mountains."),
+    ]
+    hits = [{"id": 1, "score": 0.9, "payload": {"user_id": 1, "content": "Loves hiking."}}]
+    service, db = make_service(snapshots, themes, hits, token_budget=200, memory_tokens=50)
+
+    first = await service.assemble(1, [0.1])
+    second = await service.assemble(1, [0.2])
+    assert db.personasnapshot.calls == 1 and db.themesummary.calls == 1
+    assert second.static is first.static
+    assert first.static.themes == ["childhood: Grew up near the mountains."]
+    assert second.memories == ["Loves hiking."]
+    assert service.vector_db.queries == [{"user_id": 1}, {"user_id": 1}]
+
+    # a newer snapshot invalidates the cached context, an older one does not
+    service.on_snapshot_created(1, version=1)
+    await service.assemble(1, [0.3])
+    assert db.personasnapshot.calls == 1
+    service.on_snapshot_created(1, version=2)
+    await service.assemble(1, [0.3])
+    assert db.personasnapshot.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_context_respects_token_budget():
+    snapshots = [SimpleNamespace(userId=1, version=1, summary="x" * 1000)]
+    hits = [{"payload": {"content": "y" * 100}} for _ in range(5)]
+    service, _ = make_service(snapshots, [], hits, token_budget=150, memory_tokens=60)
+
+    context = await service.assemble(1, [0.1])
+    assert context.static.tokens <= 90
+    assert len(context.memories) == 2
+    assert context.tokens <= 150
+    assert estimate_tokens(context.static.persona) <= 90
+
+
+@pytest.mark.asyncio
+async def test_snapshot_landing_during_build_is_not_masked():
+    snapshots = [SimpleNamespace(userId=1, version=1, summary="v1 persona")]
+    service, db = make_service(snapshots, [], [])
+
+    release = asyncio.Event()
+    started = asyncio.Event()
+    find_first = db.personasnapshot.find_first
+
+    async def slow_find_first(where, order):
+        row = await find_first(where, order)
+        started.set()
+        await release.wait()
+        return row
+
+    db.personasnapshot.find_first = slow_find_first
+
+    turn = asyncio.create_task(service.assemble(1, [0.1]))
+    await started.wait()
+    # v2 lands while the build that read v1 is still running
+    snapshots.append(SimpleNamespace(userId=1, version=2, summary="v2 persona"))
+    service.on_snapshot_created(1, version=2)
+    release.set()
+    assert (await turn).static.snapshot_version == 1
+
+    context = await service.assemble(1, [0.2])
+    assert context.static.snapshot_version == 2
+    assert context.static.persona == "v2 persona"
+
+
+@pytest.mark.asyncio
+async def test_memory_chunks_do_not_rebuild_cached_context():
+    snapshots = [SimpleNamespace(userId=1, version=1, summary="Calm.")]
+    hits = [{"payload": {"user_id": 1, "content": "First memory."}}]
+    service, db = make_service(snapshots, [], hits)
+
+    await service.assemble(1, [0.1])
+    service.vector_db.hits = hits + [{"payload": {"user_id": 1, "content": "New memory."}}]
+    context = await service.assemble(1, [0.1])
+
+    assert db.personasnapshot.calls == 1
+    assert context.memories == ["First memory.", "New memory."]
+
+
+@pytest.mark.asyncio
+async def test_cached_context_expires_after_ttl():
+    snapshots = [SimpleNamespace(userId=1, version=1, summary="v1 persona")]
+    service, db = make_service(snapshots, [], [], ttl=60)
+
+    await service.assemble(1, [0.1])
+    # written by another process, so no invalidation hook fires here
+    snapshots.append(SimpleNamespace(userId=1, version=2, summary="v2 persona"))
+    assert (await service.assemble(1, [0.1])).static.snapshot_version == 1
+
+    service._cache[1].built_at -= 61
+    context = await service.assemble(1, [0.1])
+    assert context.static.snapshot_version == 2
+    assert db.personasnapshot.calls == 2